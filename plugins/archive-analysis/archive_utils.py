@@ -11,10 +11,14 @@ intelligent agent decisions.
 """
 
 import json
+import os
 import re
 import subprocess
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -29,69 +33,117 @@ except ImportError:
 
 app = typer.Typer(help="Archive analysis utilities for repository cleanup")
 
+# Filename keywords reported as contains_<KEYWORD>_in_name
+ANALYSIS_KEYWORDS = ("COMPARISON", "ANALYSIS", "SESSION", "NOTES", "PROMPT", "REPORT")
 
-def run_command(cmd: list[str], cwd: str | None = None) -> tuple[str, int]:
-    """Run a shell command and return output and return code."""
-    try:
-        result = subprocess.run(
-            cmd, cwd=cwd, capture_output=True, text=True, check=False
-        )
-        return result.stdout.strip(), result.returncode
-    except Exception as e:
-        return f"Error: {e}", 1
 
+def stream_null_separated(cmd: list[str], cwd: str | None = None) -> Iterator[str]:
+    """Run a command and yield its NUL-separated output entries as they arrive.
 
-def discover_untracked_markdown(repo_root: str) -> list[str]:
-    """Find all untracked markdown files."""
-    output, returncode = run_command(["git", "status", "--porcelain"], cwd=repo_root)
+    Raises CalledProcessError once the output is exhausted if the command failed.
+    """
+    with subprocess.Popen(
+        cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ) as proc:
+        pending = b""
+        for chunk in iter(lambda: proc.stdout.read(65536), b""):
+            *entries, pending = (pending + chunk).split(b"\0")
+            for entry in entries:
+                if entry:
+                    yield os.fsdecode(entry)
+        if pending:
+            yield os.fsdecode(pending)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def list_md_files(
+    repo_root: str, pathspecs: list[str] | None = None
+) -> tuple[set[str], set[str]]:
+    """List tracked and untracked (non-ignored) files in one git call.
+
+    Defaults to all markdown files. Returns (tracked, untracked) path sets.
+    """
+    cmd = [
+        "git",
+        "ls-files",
+        "-z",
+        "-t",
+        "--cached",
+        "--others",
+        "--exclude-standard",
+        "--",
+        *(pathspecs or ["*.md"]),
+    ]
+
+    tracked: set[str] = set()
+    untracked: set[str] = set()
+    try:
+        # Each entry is "<tag> <path>"; "?" marks untracked, anything else is indexed
+        for entry in stream_null_separated(cmd, cwd=repo_root):
+            tag, _, filepath = entry.partition(" ")
+            (untracked if tag == "?" else tracked).add(filepath)
+    except (OSError, subprocess.CalledProcessError):
+        return set(), set()
 
-    if returncode != 0:
-        return []
+    return tracked, untracked
 
-    untracked = []
-    for line in output.split("\n"):
-        if line.startswith("??") and line.endswith(".md"):
-            # Extract filename (skip the ?? and whitespace)
-            filepath = line[3:].strip()
-            untracked.append(filepath)
 
-    return untracked
+def discover_untracked_markdown(repo_root: str) -> list[str]:
+    """Find all untracked markdown files."""
+    _, untracked = list_md_files(repo_root)
+    return sorted(untracked)
 
 
 def discover_all_markdown(repo_root: str) -> list[str]:
     """Find all markdown files in repo (for explore mode)."""
-    output, returncode = run_command(["git", "ls-files", "*.md"], cwd=repo_root)
+    tracked, untracked = list_md_files(repo_root)
+    return sorted(tracked) + sorted(untracked)
 
-    if returncode != 0:
-        return []
 
-    tracked = [f for f in output.split("\n") if f]
+def read_file_once(
+    full_path: Path,
+) -> tuple[os.stat_result | None, int, str | None]:
+    """Stat and read a file through one open handle.
 
-    # Also get untracked
-    untracked = discover_untracked_markdown(repo_root)
+    Returns (stat, line count, decoded text). stat is None if the file does
+    not exist; text is None (and lines 0) if it cannot be read (e.g. a
+    directory or missing permissions) or is not valid UTF-8.
+    """
+    try:
+        with open(full_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            buf = f.read()
+    except (FileNotFoundError, NotADirectoryError):
+        return None, 0, None
+    except OSError:
+        # Still report metadata for paths that exist but cannot be read
+        try:
+            return os.stat(full_path), 0, None
+        except OSError:
+            return None, 0, None
 
-    return tracked + untracked
+    try:
+        text = buf.decode("utf-8")
+    except UnicodeDecodeError:
+        return st, 0, None
 
+    lines = buf.count(b"\n") + (1 if buf and not buf.endswith(b"\n") else 0)
+    # Match text-mode reads, which translate CRLF to LF
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+    return st, lines, text
 
-def get_file_metadata(filepath: str, repo_root: str) -> dict[str, Any]:
-    """Extract metadata for a file."""
-    full_path = Path(repo_root) / filepath
 
-    if not full_path.exists():
+def get_file_metadata(st: os.stat_result | None, lines: int) -> dict[str, Any]:
+    """Extract metadata for a file from its stat result."""
+    if st is None:
         return {"exists": False, "size_kb": 0, "last_modified": None, "lines": 0}
 
-    stat = full_path.stat()
-    size_kb = round(stat.st_size / 1024, 1)
-    modified = datetime.fromtimestamp(stat.st_mtime)
+    size_kb = round(st.st_size / 1024, 1)
+    modified = datetime.fromtimestamp(st.st_mtime)
     age_days = (datetime.now() - modified).days
 
-    # Count lines
-    try:
-        with open(full_path, "r", encoding="utf-8") as f:
-            lines = len(f.readlines())
-    except Exception:
-        lines = 0
-
     return {
         "exists": True,
         "size_kb": size_kb,
@@ -101,30 +153,38 @@ def get_file_metadata(filepath: str, repo_root: str) -> dict[str, Any]:
     }
 
 
-def check_git_tracked(filepath: str, repo_root: str) -> bool:
+def repo_relative(filepath: str, repo_root: str) -> str | None:
+    """Normalize a file path to the repo-relative form git ls-files reports.
+
+    Accepts paths relative to repo_root or absolute; returns None if the path
+    is outside repo_root.
+    """
+    root = os.path.realpath(repo_root)
+    full = os.path.join(root, filepath)
+    # Resolve symlinked parent dirs (e.g. /tmp on macOS) but not the file itself
+    full = os.path.join(os.path.realpath(os.path.dirname(full)), os.path.basename(full))
+    rel = os.path.relpath(full, root)
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+        return None
+    return rel.replace(os.sep, "/")
+
+
+def check_git_tracked(filepath: str, repo_root: str, tracked: set[str]) -> bool:
     """Check if file is tracked by git."""
-    output, returncode = run_command(["git", "ls-files", filepath], cwd=repo_root)
-    return returncode == 0 and output.strip() != ""
+    return repo_relative(filepath, repo_root) in tracked
 
 
-def detect_patterns(filepath: str) -> list[str]:
+@lru_cache(maxsize=4096)
+def detect_patterns(filepath: str) -> tuple[str, ...]:
     """Detect patterns in filename that hint at purpose."""
-    patterns = []
     filename = Path(filepath).name.upper()
 
     # Analysis patterns
-    if "COMPARISON" in filename:
-        patterns.append("contains_COMPARISON_in_name")
-    if "ANALYSIS" in filename:
-        patterns.append("contains_ANALYSIS_in_name")
-    if "SESSION" in filename:
-        patterns.append("contains_SESSION_in_name")
-    if "NOTES" in filename:
-        patterns.append("contains_NOTES_in_name")
-    if "PROMPT" in filename:
-        patterns.append("contains_PROMPT_in_name")
-    if "REPORT" in filename:
-        patterns.append("contains_REPORT_in_name")
+    patterns = [
+        f"contains_{keyword}_in_name"
+        for keyword in ANALYSIS_KEYWORDS
+        if keyword in filename
+    ]
 
     # Status patterns
     if any(x in filename for x in ["DRAFT", "WIP", "TEMP", "EXPERIMENTAL"]):
@@ -140,46 +200,55 @@ def detect_patterns(filepath: str) -> list[str]:
     if filename == "TODO.MD" or filename == "TASKS.MD":
         patterns.append("task_tracking")
 
-    return patterns
-
+    return tuple(patterns)
 
-def find_references(filepath: str, repo_root: str) -> dict[str, Any]:
-    """Find all references to a file in the repository."""
-    filename = Path(filepath).name
 
-    # Use git grep to find references
-    # Look for the filename in markdown links and other references
-    output, returncode = run_command(["git", "grep", "-l", filename], cwd=repo_root)
+def build_reference_index(filepaths: list[str], repo_root: str) -> dict[str, set[str]]:
+    """Map each basename to the files that mention it, using one git grep."""
+    filenames = sorted({Path(f).name for f in filepaths})
+    index: dict[str, set[str]] = {name: set() for name in filenames}
+    if not filenames:
+        return index
 
-    referenced_by = []
-    if returncode == 0 and output:
-        referenced_by = [f for f in output.split("\n") if f and f != filepath]
+    # Literal match on the bare filename; markdown links to the file are a
+    # subset of these hits, so a separate link-pattern grep is not needed.
+    # Output stays bytes so a file in another encoding cannot break decoding
+    # for every other match.
+    try:
+        result = subprocess.run(
+            ["git", "grep", "--null", "-F", "-f", "-"],
+            cwd=repo_root,
+            input=b"".join(os.fsencode(name) + b"\n" for name in filenames),
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return index
+    if result.returncode != 0:
+        return index
+
+    encoded = [(name, os.fsencode(name)) for name in filenames]
+    for line in result.stdout.split(b"\n"):
+        path, sep, text = line.partition(b"\0")
+        if not sep:
+            continue
+        for name, needle in encoded:
+            if needle in text:
+                index[name].add(os.fsdecode(path))
 
-    # Also check for markdown link patterns specifically
-    link_pattern = f"\\[.*\\]\\(.*{re.escape(filename)}.*\\)"
-    output2, returncode2 = run_command(
-        ["git", "grep", "-l", "-E", link_pattern], cwd=repo_root
-    )
+    return index
 
-    if returncode2 == 0 and output2:
-        for f in output2.split("\n"):
-            if f and f != filepath and f not in referenced_by:
-                referenced_by.append(f)
 
+def find_references(filepath: str, ref_index: dict[str, set[str]]) -> dict[str, Any]:
+    """Find all references to a file in the repository."""
+    filename = Path(filepath).name
+    referenced_by = sorted(f for f in ref_index.get(filename, ()) if f != filepath)
     return {"inbound_count": len(referenced_by), "inbound_from": referenced_by}
 
 
-def analyze_content(filepath: str, repo_root: str) -> dict[str, Any]:
+def analyze_content(content: str | None) -> dict[str, Any]:
     """Analyze file content for structure and key elements."""
-    full_path = Path(repo_root) / filepath
-
-    if not full_path.exists():
-        return {}
-
-    try:
-        with open(full_path, "r", encoding="utf-8") as f:
-            content = f.read()
-    except Exception:
+    if content is None:
         return {"error": "Could not read file"}
 
     # Extract top-level headings
@@ -210,15 +279,19 @@ def analyze_content(filepath: str, repo_root: str) -> dict[str, Any]:
     }
 
 
-def find_related_files(filepath: str, all_files: list[str]) -> dict[str, list[str]]:
-    """Find files that might be related to this one."""
-    filename = Path(filepath).name
-    base_name = filename.split(".")[0]
+def find_related_files(
+    filepath: str, lower_names: dict[str, str]
+) -> dict[str, list[str]]:
+    """Find files that might be related to this one.
+
+    lower_names maps every candidate path to its lowercased basename.
+    """
+    base_name = lower_names[filepath].split(".")[0]
 
     # Find files with similar names
     similar_names = []
-    for f in all_files:
-        if f != filepath and base_name.lower() in Path(f).name.lower():
+    for f, name in lower_names.items():
+        if f != filepath and base_name in name:
             similar_names.append(f)
 
     return {
@@ -231,16 +304,18 @@ def detect_convention(repo_root: str) -> dict[str, Any]:
     archive_path = Path(repo_root) / "archive"
     index_path = archive_path / "index.md"
 
-    exists = archive_path.exists() and archive_path.is_dir()
+    # is_dir() is already False for a missing path
+    exists = archive_path.is_dir()
     index_exists = index_path.exists()
 
     existing_archives = []
     if exists:
         try:
-            # List archived files
-            for item in archive_path.iterdir():
-                if item.is_file() and item.name != "index.md":
-                    existing_archives.append(item.name)
+            # List archived files; scandir entries know their type without a stat
+            with os.scandir(archive_path) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name != "index.md":
+                        existing_archives.append(entry.name)
         except Exception:
             pass
 
@@ -252,45 +327,67 @@ def detect_convention(repo_root: str) -> dict[str, Any]:
     }
 
 
+def _analyze_one(
+    filepath: str,
+    repo_root: str,
+    tracked: set[str],
+    ref_index: dict[str, set[str]],
+    lower_names: dict[str, str],
+) -> dict[str, Any] | None:
+    """Build the analysis record for a single file, or None if it is missing."""
+    st, lines, content = read_file_once(Path(repo_root) / filepath)
+    metadata = get_file_metadata(st, lines)
+    if not metadata["exists"]:
+        return None
+
+    return {
+        "path": filepath,
+        "metadata": {
+            **metadata,
+            "git_tracked": check_git_tracked(filepath, repo_root, tracked),
+        },
+        "patterns_detected": detect_patterns(filepath),
+        "references": find_references(filepath, ref_index),
+        "content_structure": analyze_content(content),
+        "related_files": find_related_files(filepath, lower_names),
+    }
+
+
 def analyze_files_impl(
     file_paths: list[str] | None, mode: str, repo_root: str
 ) -> dict[str, Any]:
     """Main analysis function."""
 
-    # Discover files based on mode
+    # Discover files based on mode; one ls-files call also yields tracked status
     if file_paths:
         # Explicit files provided
         discovered_files = file_paths
-    elif mode == "untracked":
-        discovered_files = discover_untracked_markdown(repo_root)
-    elif mode == "explore":
-        discovered_files = discover_all_markdown(repo_root)
+        # Literal repo-relative pathspecs: absolute paths and glob characters
+        # in names must not change what ls-files matches, and paths outside
+        # the repo would make it fail for every file
+        relative = {repo_relative(f, repo_root) for f in file_paths} - {None}
+        pathspecs = [f":(literal){f}" for f in sorted(relative)]
+        tracked = list_md_files(repo_root, pathspecs)[0] if pathspecs else set()
     else:
-        discovered_files = []
-
-    # Analyze each file
-    file_analyses = []
-    for filepath in discovered_files:
-        metadata = get_file_metadata(filepath, repo_root)
-        if not metadata["exists"]:
-            continue
-
-        git_tracked = check_git_tracked(filepath, repo_root)
-        patterns = detect_patterns(filepath)
-        references = find_references(filepath, repo_root)
-        content = analyze_content(filepath, repo_root)
-        related = find_related_files(filepath, discovered_files)
-
-        file_analyses.append(
-            {
-                "path": filepath,
-                "metadata": {**metadata, "git_tracked": git_tracked},
-                "patterns_detected": patterns,
-                "references": references,
-                "content_structure": content,
-                "related_files": related,
-            }
+        tracked, untracked = list_md_files(repo_root)
+        if mode == "untracked":
+            discovered_files = sorted(untracked)
+        elif mode == "explore":
+            discovered_files = sorted(tracked) + sorted(untracked)
+        else:
+            discovered_files = []
+
+    ref_index = build_reference_index(discovered_files, repo_root)
+    # Every file is compared to every other by name; lowercase each once
+    lower_names = {f: Path(f).name.lower() for f in discovered_files}
+
+    # Analyze each file; per-file work is stat/read bound, so threads overlap it
+    with ThreadPoolExecutor(max_workers=min(32, len(discovered_files) or 1)) as pool:
+        results = pool.map(
+            lambda f: _analyze_one(f, repo_root, tracked, ref_index, lower_names),
+            discovered_files,
         )
+        file_analyses = [r for r in results if r is not None]
 
     # Generate summary
     total_size_kb = sum(f["metadata"]["size_kb"] for f in file_analyses)
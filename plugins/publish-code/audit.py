@@ -14,18 +14,105 @@ Install: brew install gitleaks typos-cli lychee markdownlint-cli gh
 Config: .markdownlint.json in skill dir provides sensible defaults.
 Uses project's config if present, otherwise falls back to skill config.
 
-Limits: Scans first 300 tracked files, skips files >200KB.
+Usage: audit.py [repo-path] [--max-files N]
+
+Limits: Scans up to 300 tracked non-binary files (--max-files), recently
+changed ones first, and skips files >200KB. The hardcoded path check uses
+git grep over all tracked text files when available.
+Link check results (for an hour) and gitleaks findings (per git history
+state) are cached in ~/.cache/publish-code.
 """
 
+import argparse
+import hashlib
 import json
+import os
 import re
 import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 REQUIRED_TOOLS = ["gitleaks", "typos", "lychee", "markdownlint", "gh"]
 
+# Default cap on files read by the content scanners
+MAX_FILES = 300
+
+# markdownlint issue line, e.g. "README.md:15:9 error MD060/table-column-style ..."
+MARKDOWNLINT_ISSUE_RE = re.compile(r"(.+?):(\d+):\d+ error (\S+)")
+
+# Files per markdownlint invocation, keeps argv well below OS limits
+MARKDOWNLINT_BATCH_SIZE = 500
+
+# Per-user cache for results reused across runs and audited repos
+# XDG_CACHE_HOME only counts if set to an absolute path, per the XDG spec
+_CACHE_HOME = Path(os.environ.get("XDG_CACHE_HOME") or ".")
+if not _CACHE_HOME.is_absolute():
+    _CACHE_HOME = Path.home() / ".cache"
+CACHE_DIR = _CACHE_HOME / "publish-code"
+LINK_CACHE_MAX_AGE = "1h"
+GITLEAKS_CACHE_MAX_ENTRIES = 64
+
+# Anything lychee may treat as a link: URLs, inline markdown links, reference
+# definitions ("[id]: ./file.md") and HTML href/src attributes (POSIX ERE)
+LINK_PATTERN = r"https?://|\]\(|^[[:space:]]*\[[^]]+\]:|(href|src)="
+
+# Total length of input paths per lychee invocation, below the smallest
+# common argv limit (32K on Windows)
+LYCHEE_ARGV_BUDGET = 24_000
+
+# File types lychee checks by default when walking a directory
+LINK_FILE_EXTENSIONS = (
+    "md",
+    "mkd",
+    "mdx",
+    "mdown",
+    "mdwn",
+    "mkdn",
+    "mkdown",
+    "markdown",
+    "html",
+    "htm",
+    "txt",
+)
+
+# Binary formats left out of the tracked file listing
+SKIP_EXTENSIONS = {
+    ".png",
+    ".jpg",
+    ".gif",
+    ".ico",
+    ".woff",
+    ".ttf",
+    ".pdf",
+    ".zip",
+    ".gz",
+    ".tar",
+}
+
+# User home paths that break portability. Each pattern is valid as both a
+# Python regex and a POSIX ERE, so git grep and the fallback share them.
+HARDCODED_PATH_PATTERNS = {
+    "macos": r"/Users/[a-zA-Z0-9_-]+/",
+    "linux": r"/home/[a-zA-Z0-9_-]+/",
+    "windows": r"C:\\Users\\[a-zA-Z0-9_-]+\\",
+}
+HARDCODED_PATH_TYPES = {
+    "macos": "macOS user path",
+    "linux": "Linux user path",
+    "windows": "Windows user path",
+}
+# Literal prefix every pattern above starts with, for cheap prefiltering
+HARDCODED_PATH_PREFIXES = (b"/Users/", b"/home/", b"C:\\Users\\")
+# Fused into one alternation; the named group that matched identifies the platform
+HARDCODED_PATH_RE = re.compile(
+    "|".join(f"(?P<{name}>{p})" for name, p in HARDCODED_PATH_PATTERNS.items()).encode()
+)
+
 
 def check_tools() -> list[str]:
     """Check for required external tools."""
@@ -33,24 +120,121 @@ def check_tools() -> list[str]:
 
 
 def get_tracked_files(repo_path: Path) -> list[str]:
-    """Get list of git-tracked files."""
+    """Get list of git-tracked files, excluding binary formats.
+
+    Streams NUL-separated output, which also avoids git's quoting of unusual
+    filenames, instead of buffering the whole listing before splitting.
+    """
+    # Let git drop binaries from the index listing via exclude pathspecs
+    excludes = [f":(exclude,icase)*{ext}" for ext in sorted(SKIP_EXTENSIONS)]
+    files = []
+    with subprocess.Popen(
+        ["git", "ls-files", "-z", "--", ".", *excludes],
+        cwd=repo_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ) as proc:
+        pending = b""
+        for chunk in iter(lambda: proc.stdout.read(65536), b""):
+            *entries, pending = (pending + chunk).split(b"\0")
+            files.extend(os.fsdecode(e) for e in entries if e)
+    if pending:
+        files.append(os.fsdecode(pending))
+    return files
+
+
+def get_history_key(repo_path: Path) -> str | None:
+    """Fingerprint what gitleaks scans and with which rules.
+
+    Covers every ref tip, the config files and environment variables, and the
+    gitleaks version, since default rules change between releases. Returns
+    None if the refs or the version cannot be read (e.g. a repo without
+    commits).
+    """
     result = subprocess.run(
-        ["git", "ls-files"], cwd=repo_path, capture_output=True, text=True
+        ["git", "rev-parse", "HEAD", "--all"],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
     )
-    return result.stdout.strip().split("\n") if result.stdout.strip() else []
+    if result.returncode != 0:
+        return None
+    version = subprocess.run(["gitleaks", "version"], capture_output=True)
+    if version.returncode != 0:
+        return None
+
+    digest = hashlib.sha256(result.stdout.encode())
+    digest.update(b"version\0" + version.stdout)
+    for name in ("GITLEAKS_CONFIG", "GITLEAKS_CONFIG_TOML"):
+        value = os.environ.get(name)
+        if value is not None:
+            digest.update(f"{name}\0{value}".encode())
+    configs = [repo_path / ".gitleaks.toml", repo_path / ".gitleaksignore"]
+    if os.environ.get("GITLEAKS_CONFIG"):
+        configs.append(Path(os.environ["GITLEAKS_CONFIG"]))
+    for config in configs:
+        if config.is_file():
+            digest.update(str(config).encode() + b"\0" + config.read_bytes())
+    return digest.hexdigest()
 
 
 def scan_secrets(repo_path: Path) -> list[dict]:
-    """Use gitleaks to scan for secrets in git history."""
+    """Use gitleaks to scan for secrets in git history.
+
+    Findings are cached by history fingerprint, so unchanged repos skip the
+    full history walk on repeat runs. Caching is best effort.
+    """
+    key = get_history_key(repo_path)
+    cache_dir = CACHE_DIR / "gitleaks"
+    cache_file = cache_dir / f"{key}.json"
+    if key and cache_file.is_file():
+        try:
+            findings = json.loads(cache_file.read_text())
+            os.utime(cache_file)  # Mark as recently used for pruning
+            return findings
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    findings = run_gitleaks(repo_path)
+    if key and not any("error" in f for f in findings):
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(findings))
+            prune_cache(cache_dir, GITLEAKS_CACHE_MAX_ENTRIES)
+        except OSError:
+            pass  # Caching is best effort
+    return findings
+
+
+def prune_cache(cache_dir: Path, max_entries: int) -> None:
+    """Delete all but the most recently used entries in a cache directory."""
+    with os.scandir(cache_dir) as entries:
+        files = [
+            (entry.stat().st_mtime, entry.path) for entry in entries if entry.is_file()
+        ]
+    files.sort(reverse=True)
+    for _, path in files[max_entries:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def run_gitleaks(repo_path: Path) -> list[dict]:
+    """Run gitleaks over the full git history."""
     result = subprocess.run(
-        ["gitleaks", "detect", "--source", str(repo_path), "--report-format", "json"],
+        ["gitleaks", "detect", "--no-banner", "--source", str(repo_path)]
+        + ["--report-format", "json"],
         capture_output=True,
-        text=True,
         timeout=60,
     )
+    # Output stays bytes: json.loads takes them directly, stderr is only
+    # decoded when reporting a failure
     if result.returncode not in (0, 1):
-        return [{"error": f"gitleaks failed: {result.stderr}"}]
-    if not result.stdout.strip():
+        stderr = result.stderr.decode("utf-8", "replace")
+        return [{"error": f"gitleaks failed: {stderr}"}]
+    # Exit 0 means no leaks, so there is no report worth parsing
+    if result.returncode == 0 or not result.stdout.strip():
         return []
 
     return [
@@ -64,56 +248,123 @@ def scan_secrets(repo_path: Path) -> list[dict]:
 
 
 def scan_typos(repo_path: Path) -> list[dict]:
-    """Use typos to find spelling mistakes."""
-    result = subprocess.run(
-        ["typos", "--format", "json", str(repo_path)],
-        capture_output=True,
-        text=True,
-        timeout=60,
-    )
-    if result.returncode not in (0, 2):
-        return [{"error": f"typos failed: {result.stderr}"}]
-    if not result.stdout.strip():
-        return []
+    """Use typos to find spelling mistakes.
 
+    typos emits one JSON object per line; parse them from a binary pipe as
+    they arrive rather than buffering and decoding the whole output.
+    """
     issues = []
-    for line in result.stdout.strip().split("\n"):
-        if not line:
-            continue
-        try:
-            f = json.loads(line)
-            if f.get("type") == "typo":
-                issues.append(
-                    {
-                        "file": f.get("path", "unknown"),
-                        "line": f.get("line_num", 0),
-                        "typo": f.get("typo", ""),
-                        "corrections": f.get("corrections", []),
-                    }
-                )
-        except json.JSONDecodeError:
-            continue
+    with tempfile.TemporaryFile() as stderr:
+        with subprocess.Popen(
+            ["typos", "--format", "json", str(repo_path)],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        ) as proc:
+            timer = threading.Timer(60, proc.kill)
+            timer.start()
+            try:
+                for line in proc.stdout:
+                    if not line.strip():
+                        continue
+                    try:
+                        f = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if f.get("type") == "typo":
+                        issues.append(
+                            {
+                                "file": f.get("path", "unknown"),
+                                "line": f.get("line_num", 0),
+                                "typo": f.get("typo", ""),
+                                "corrections": f.get("corrections", []),
+                            }
+                        )
+            finally:
+                timer.cancel()
+
+        if proc.returncode not in (0, 2):
+            stderr.seek(0)
+            message = stderr.read().decode(errors="replace")
+            return [{"error": f"typos failed: {message}"}]
     return issues
 
 
-def scan_links(repo_path: Path) -> list[dict]:
-    """Use lychee to check links in markdown files."""
+def find_link_files(repo_path: Path) -> list[str] | None:
+    """List tracked docs that contain links, using one git grep -l.
+
+    Returns None if git grep fails, so callers can scan the whole tree.
+    """
+    # -z keeps non-ASCII paths unquoted
     result = subprocess.run(
-        ["lychee", "--format", "json", "--no-progress", str(repo_path)],
+        ["git", "grep", "-l", "-z", "-I", "-i", "-E", LINK_PATTERN, "--"]
+        + [f"*.{ext}" for ext in LINK_FILE_EXTENSIONS],
+        cwd=repo_path,
         capture_output=True,
-        text=True,
-        timeout=120,
     )
-    # lychee exits 0 if all ok, 1 if issues, 2 if errors
-    if result.returncode not in (0, 1, 2):
-        return [{"error": f"lychee failed: {result.stderr}"}]
-    if not result.stdout.strip():
+    # git grep exits 1 when nothing matches
+    if result.returncode not in (0, 1):
+        return None
+    return [os.fsdecode(f) for f in result.stdout.split(b"\0") if f]
+
+
+def scan_links(repo_path: Path) -> list[dict]:
+    """Use lychee to check links in markdown files."""
+    # Hand lychee only the files that can contain links instead of the whole tree
+    root = repo_path.resolve()
+    link_files = find_link_files(repo_path)
+    if link_files is None:
+        inputs = [str(root)]
+    elif link_files:
+        inputs = [str(root / f) for f in link_files]
+    else:
         return []
 
+    cmd = ["lychee", "--format", "json", "--no-progress"]
+    # lychee only picks up lychee.toml and .lycheeignore from its working
+    # directory, which is not the repo below; pass the repo's ones explicitly
+    config = root / "lychee.toml"
+    if config.is_file():
+        cmd.extend(["--config", str(config)])
+    ignore_file = root / ".lycheeignore"
+    if ignore_file.is_file():
+        for line in ignore_file.read_text(errors="replace").splitlines():
+            pattern = line.strip()
+            if pattern and not pattern.startswith("#"):
+                cmd.extend(["--exclude", pattern])
+
+    # lychee keeps its URL cache in the working directory; run it from a
+    # per-user cache dir so results are reused across repos and runs.
+    # Caching is best effort: without a usable cache dir, check uncached.
     try:
-        data = json.loads(result.stdout)
-        issues = []
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cwd = CACHE_DIR
+        cmd.extend(["--cache", "--max-cache-age", LINK_CACHE_MAX_AGE])
+    except OSError:
+        cwd = None
+
+    issues = []
+    for batch in batch_by_length(inputs, LYCHEE_ARGV_BUDGET):
+        result = subprocess.run(
+            cmd + batch,
+            cwd=cwd,
+            capture_output=True,
+            timeout=120,
+        )
+        # lychee exits 0 if all ok, 1 if issues, 2 if errors
+        if result.returncode not in (0, 1, 2):
+            stderr = result.stderr.decode("utf-8", "replace")
+            return [{"error": f"lychee failed: {stderr}"}]
+        if not result.stdout.strip():
+            continue
+
+        try:
+            data = json.loads(result.stdout)
+        except json.JSONDecodeError:
+            return [{"error": "Failed to parse lychee output"}]
         for file, errors in data.get("error_map", {}).items():
+            file_path = Path(file)
+            if file_path.is_relative_to(root):
+                file = str(file_path.relative_to(root))
             for err in errors:
                 issues.append(
                     {
@@ -123,14 +374,26 @@ def scan_links(repo_path: Path) -> list[dict]:
                         "error": err.get("status", {}).get("text", "unknown"),
                     }
                 )
-        return issues
-    except json.JSONDecodeError:
-        return [{"error": "Failed to parse lychee output"}]
+    return issues
+
+
+def batch_by_length(args: list[str], budget: int) -> list[list[str]]:
+    """Split arguments into batches whose combined length stays within budget."""
+    batches: list[list[str]] = []
+    size = budget
+    for arg in args:
+        # +1 for the separator between arguments
+        if size + len(arg) + 1 > budget:
+            batches.append([])
+            size = 0
+        batches[-1].append(arg)
+        size += len(arg) + 1
+    return batches
 
 
 def fix_markdown(repo_path: Path, tracked_files: list[str]) -> list[dict]:
     """Run markdownlint --fix and return unfixable issues."""
-    md_files = [str(repo_path / f) for f in tracked_files if f.endswith(".md")]
+    md_files = [f for f in tracked_files if f.endswith(".md")]
     if not md_files:
         return []
 
@@ -139,98 +402,203 @@ def fix_markdown(repo_path: Path, tracked_files: list[str]) -> list[dict]:
     project_configs = [".markdownlint.json", ".markdownlintrc", ".markdownlint.yaml"]
     if not any((repo_path / c).exists() for c in project_configs):
         # Use skill's default config (disables noisy style rules)
-        skill_config = Path(__file__).parent / ".markdownlint.json"
+        skill_config = Path(__file__).resolve().parent / ".markdownlint.json"
         if skill_config.exists():
             cmd.extend(["--config", str(skill_config)])
 
+    # Repo-relative paths with cwd=repo_path keep argv short and issue paths
+    # consistent with the other checks
+    issues = []
+    for start in range(0, len(md_files), MARKDOWNLINT_BATCH_SIZE):
+        result = subprocess.run(
+            cmd + md_files[start : start + MARKDOWNLINT_BATCH_SIZE],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        # Exit 0 = all fixed, Exit 1 = unfixable issues remain
+        if result.returncode == 0:
+            continue
+
+        # Parse stderr for remaining issues (format: "file:line rule description")
+        for line in result.stderr.splitlines():
+            # markdownlint always reports issues as lowercase " error "
+            if " error " not in line:
+                continue
+            match = MARKDOWNLINT_ISSUE_RE.match(line)
+            if match:
+                issues.append(
+                    {
+                        "file": match.group(1),
+                        "line": int(match.group(2)),
+                        "rule": match.group(3),
+                        "message": line,
+                    }
+                )
+    return issues
+
+
+def get_file_sizes(repo_path: Path, file_paths: list[str]) -> dict[str, int]:
+    """Get sizes of the given regular files with one os.scandir per directory.
+
+    DirEntry caches file type (and on Windows, size) from the directory
+    listing, so this avoids separate exists/is_file/stat calls per path.
+    Missing paths and non-regular files are left out.
+    """
+    by_dir: dict[str, set[str]] = defaultdict(set)
+    for file_path in file_paths:
+        parent, _, name = file_path.rpartition("/")
+        by_dir[parent].add(name)
+
+    sizes = {}
+    for parent, names in by_dir.items():
+        try:
+            with os.scandir(repo_path / parent) as entries:
+                for entry in entries:
+                    if entry.name in names and entry.is_file():
+                        key = f"{parent}/{entry.name}" if parent else entry.name
+                        sizes[key] = entry.stat().st_size
+        except OSError:
+            continue
+    return sizes
+
+
+def get_recently_changed_files(repo_path: Path, n_commits: int = 500) -> list[str]:
+    """List files touched by the last n commits, most recent first."""
+    # -z keeps non-ASCII paths unquoted so they match the ls-files listing
     result = subprocess.run(
-        cmd + md_files,
+        ["git", "log", "-z", "--name-only", "--pretty=format:", "-n", str(n_commits)],
+        cwd=repo_path,
         capture_output=True,
-        text=True,
-        timeout=60,
     )
-    # Exit 0 = all fixed, Exit 1 = unfixable issues remain
-    if result.returncode == 0:
+    if result.returncode != 0:
         return []
+    return list(dict.fromkeys(os.fsdecode(f) for f in result.stdout.split(b"\0") if f))
+
+
+def select_scan_files(
+    repo_path: Path, tracked_files: list[str], max_files: int
+) -> list[str]:
+    """Pick files for content scanning, recently changed ones first, up to the cap."""
+    tracked = set(tracked_files)
+    recent = [f for f in get_recently_changed_files(repo_path) if f in tracked]
+    recent_set = set(recent)
+    ordered = recent + [f for f in tracked_files if f not in recent_set]
+    return ordered[:max_files]
+
+
+def read_file_bytes(full_path: Path) -> bytes | None:
+    """Read a file's raw bytes, or None if it is unreadable or looks binary."""
+    try:
+        with open(full_path, "rb") as f:
+            # A NUL byte in the first block marks binaries the extension list missed
+            head = f.read(4096)
+            if b"\0" in head:
+                return None
+            return head + f.read()
+    except OSError:
+        return None
+
+
+def read_scan_files(repo_path: Path, scan_files: list[str]) -> dict[str, bytes]:
+    """Read scannable files once, for reuse across content scanners.
+
+    Contents stay undecoded bytes; scanners match byte patterns directly.
+    """
+    sizes = get_file_sizes(repo_path, scan_files)
+    to_read = [f for f in scan_files if f in sizes and sizes[f] <= 200000]
+
+    # Reads release the GIL, so a thread pool overlaps the per-file I/O
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        datas = pool.map(lambda f: read_file_bytes(repo_path / f), to_read)
+        return {f: data for f, data in zip(to_read, datas) if data is not None}
+
+
+def grep_hardcoded_paths(repo_path: Path) -> list[dict] | None:
+    """Find hardcoded user paths across all tracked text files via git grep.
+
+    Returns None if git grep is unavailable or fails, so callers can fall
+    back to scanning file contents in Python.
+    """
+    cmd = ["git", "grep", "--null", "-n", "-I", "--max-count", "1", "-E"]
+    for pattern in HARDCODED_PATH_PATTERNS.values():
+        cmd.extend(["-e", pattern])
+    try:
+        result = subprocess.run(cmd, cwd=repo_path, capture_output=True)
+    except OSError:
+        return None
+    # git grep exits 1 when nothing matches
+    if result.returncode not in (0, 1):
+        return None
 
-    # Parse stderr for remaining issues (format: "file:line rule description")
     issues = []
-    for line in result.stderr.strip().split("\n"):
-        if not line or "error" not in line.lower():
+    for hit in result.stdout.split(b"\n"):
+        # Format: "file\0line\0text"
+        parts = hit.split(b"\0", 2)
+        if len(parts) != 3:
             continue
-        # Example: "README.md:15:9 error MD060/table-column-style ..."
-        match = re.match(r"(.+?):(\d+):\d+ error (\S+)", line)
+        file_path, line_num, line = parts
+        match = HARDCODED_PATH_RE.search(line)
         if match:
             issues.append(
                 {
-                    "file": match.group(1),
-                    "line": int(match.group(2)),
-                    "rule": match.group(3),
-                    "message": line,
+                    "file": os.fsdecode(file_path),
+                    "line": int(line_num),
+                    "type": HARDCODED_PATH_TYPES[match.lastgroup],
+                    "sample": line.decode(errors="replace").strip()[:100],
                 }
             )
     return issues
 
 
-def scan_hardcoded_paths(repo_path: Path, tracked_files: list[str]) -> list[dict]:
+def scan_hardcoded_paths(contents: dict[str, bytes]) -> list[dict]:
     """Find hardcoded user paths that break portability."""
     issues = []
-    patterns = [
-        (r"/Users/[a-zA-Z0-9_-]+/", "macOS user path"),
-        (r"/home/[a-zA-Z0-9_-]+/", "Linux user path"),
-        (r"C:\\Users\\[a-zA-Z0-9_-]+\\", "Windows user path"),
-    ]
-    skip_ext = {
-        ".png",
-        ".jpg",
-        ".gif",
-        ".ico",
-        ".woff",
-        ".ttf",
-        ".pdf",
-        ".zip",
-        ".gz",
-        ".tar",
-    }
-
-    for file_path in tracked_files[:300]:
-        full_path = repo_path / file_path
-        if not full_path.exists() or not full_path.is_file():
+    for file_path, content in contents.items():
+        # Substring checks are far cheaper than regex; most files have no hits
+        if not any(prefix in content for prefix in HARDCODED_PATH_PREFIXES):
             continue
-        if full_path.suffix.lower() in skip_ext or full_path.stat().st_size > 200000:
-            continue
-
-        try:
-            content = full_path.read_text(errors="ignore")
-            for pattern, desc in patterns:
-                for line_num, line in enumerate(content.split("\n"), 1):
-                    if re.search(pattern, line):
-                        issues.append(
-                            {
-                                "file": file_path,
-                                "line": line_num,
-                                "type": desc,
-                                "sample": line.strip()[:100],
-                            }
-                        )
-                        break
-                else:
-                    continue
-                break
-        except Exception:
+        # Patterns cannot span lines, so the first match in the whole text is
+        # the first matching line; derive its number and text from offsets
+        match = HARDCODED_PATH_RE.search(content)
+        if not match:
             continue
+        start = match.start()
+        line_start = content.rfind(b"\n", 0, start) + 1
+        line_end = content.find(b"\n", start)
+        line = content[line_start : line_end if line_end != -1 else None]
+        issues.append(
+            {
+                "file": file_path,
+                "line": content.count(b"\n", 0, start) + 1,
+                "type": HARDCODED_PATH_TYPES[match.lastgroup],
+                "sample": line.decode(errors="replace").strip()[:100],
+            }
+        )
     return issues
 
 
 def get_git_identity(repo_path: Path) -> list[str]:
     """Get user's git identity patterns to search for."""
+    # One config call for both keys; entries are "key\nvalue\0"
+    result = subprocess.run(
+        ["git", "config", "--null", "--get-regexp", r"^user\.(name|email)$"],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+    )
+    # Later entries (e.g. repo-local over global) win, as with "git config <key>"
+    values = {}
+    for entry in result.stdout.split("\0"):
+        key, _, value = entry.partition("\n")
+        if value.strip():
+            values[key] = value.strip()
+
     patterns = []
     for key in ["user.name", "user.email"]:
-        result = subprocess.run(
-            ["git", "config", key], cwd=repo_path, capture_output=True, text=True
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            value = result.stdout.strip()
+        if key in values:
+            value = values[key]
             patterns.append(value)
             # Extract username from email (before @)
             if "@" in value:
@@ -238,51 +606,67 @@ def get_git_identity(repo_path: Path) -> list[str]:
     return [p for p in patterns if len(p) > 2]  # Skip very short patterns
 
 
-def scan_personal_refs(repo_path: Path, tracked_files: list[str]) -> list[dict]:
+def scan_personal_refs(repo_path: Path, contents: dict[str, bytes]) -> list[dict]:
     """Find references to user's git identity (name, email, username)."""
     patterns = get_git_identity(repo_path)
     if not patterns:
         return []
 
     issues = []
-    skip_ext = {".png", ".jpg", ".gif", ".pdf", ".zip", ".gz", ".tar", ".lock"}
     skip_files = {"LICENSE", "LICENCE", "CHANGELOG.md", ".git"}
-
-    for file_path in tracked_files[:300]:
-        if any(skip in file_path for skip in skip_files):
-            continue
-        full_path = repo_path / file_path
-        if not full_path.exists() or not full_path.is_file():
+    # bytes.lower() only folds ASCII, so non-ASCII identities (e.g. "Jörg")
+    # need a decode and Unicode casefold to stay case-insensitive
+    ascii_only = all(pattern.isascii() for pattern in patterns)
+    if ascii_only:
+        needles = [(pattern, pattern.encode().lower()) for pattern in patterns]
+    else:
+        needles = [(pattern, pattern.casefold()) for pattern in patterns]
+
+    for file_path, content in contents.items():
+        if file_path.lower().endswith(".lock"):
             continue
-        if full_path.suffix.lower() in skip_ext or full_path.stat().st_size > 200000:
+        if any(skip in file_path for skip in skip_files):
             continue
 
-        try:
-            content = full_path.read_text(errors="ignore")
-            for pattern in patterns:
-                if pattern.lower() in content.lower():
-                    issues.append({"file": file_path, "pattern": pattern})
-                    break  # One issue per file
-        except Exception:
-            continue
+        # Once per file, shared by all patterns
+        if ascii_only:
+            lowered = content.lower()
+        else:
+            lowered = content.decode(errors="ignore").casefold()
+        for pattern, needle in needles:
+            if needle in lowered:
+                issues.append({"file": file_path, "pattern": pattern})
+                break  # One issue per file
 
     return issues
 
 
 def check_basics(repo_path: Path) -> dict:
     """Check for basic required files."""
+    # One directory listing instead of a glob per file kind
+    with os.scandir(repo_path) as entries:
+        names = [entry.name for entry in entries]
     return {
-        "has_license": bool(
-            list(repo_path.glob("LICENSE*")) + list(repo_path.glob("LICENCE*"))
-        ),
-        "has_readme": bool(list(repo_path.glob("README*"))),
-        "has_contributing": bool(list(repo_path.glob("CONTRIBUTING*"))),
-        "has_gitignore": (repo_path / ".gitignore").exists(),
+        "has_license": any(n.startswith(("LICENSE", "LICENCE")) for n in names),
+        "has_readme": any(n.startswith("README") for n in names),
+        "has_contributing": any(n.startswith("CONTRIBUTING") for n in names),
+        "has_gitignore": ".gitignore" in names,
     }
 
 
 def main():
-    repo_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd()
+    parser = argparse.ArgumentParser(description="Mechanical publish-code audit")
+    parser.add_argument("repo_path", nargs="?", type=Path, default=Path.cwd())
+    parser.add_argument(
+        "--max-files",
+        type=int,
+        default=MAX_FILES,
+        help=f"Max files read by content scanners (default: {MAX_FILES})",
+    )
+    args = parser.parse_args()
+    if args.max_files < 0:
+        parser.error("--max-files must not be negative")
+    repo_path = args.repo_path
 
     missing = check_tools()
     if missing:
@@ -306,18 +690,42 @@ def main():
 
     tracked_files = get_tracked_files(repo_path)
 
-    result = {
-        "repo_path": str(repo_path),
-        "repo_name": repo_path.name,
-        "files_checked": len(tracked_files[:300]),
-        "basics": check_basics(repo_path),
-        "secrets": scan_secrets(repo_path),
-        "typos": scan_typos(repo_path),
-        "broken_links": scan_links(repo_path),
-        "markdown_unfixable": fix_markdown(repo_path, tracked_files),
-        "hardcoded_paths": scan_hardcoded_paths(repo_path, tracked_files),
-        "personal_refs": scan_personal_refs(repo_path, tracked_files),
-    }
+    # Scans mostly wait on external tools or disk, so threads overlap them
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        # gitleaks reads git history only, so it can run during the fixes
+        secrets = pool.submit(scan_secrets, repo_path)
+        # Picking scan files walks recent history; overlap it with the fixes
+        selected = pool.submit(
+            select_scan_files, repo_path, tracked_files, args.max_files
+        )
+        # markdownlint --fix rewrites files; scan the working tree afterwards
+        markdown_unfixable = fix_markdown(repo_path, tracked_files)
+
+        typos = pool.submit(scan_typos, repo_path)
+        broken_links = pool.submit(scan_links, repo_path)
+        grepped_paths = pool.submit(grep_hardcoded_paths, repo_path)
+        basics = pool.submit(check_basics, repo_path)
+        # The remaining scanners share file contents read on this thread
+        scan_files = selected.result()
+        contents = read_scan_files(repo_path, scan_files)
+        personal_refs = pool.submit(scan_personal_refs, repo_path, contents)
+
+        hardcoded_paths = grepped_paths.result()
+        if hardcoded_paths is None:
+            hardcoded_paths = scan_hardcoded_paths(contents)
+
+        result = {
+            "repo_path": str(repo_path),
+            "repo_name": repo_path.name,
+            "files_checked": len(scan_files),
+            "basics": basics.result(),
+            "secrets": secrets.result(),
+            "typos": typos.result(),
+            "broken_links": broken_links.result(),
+            "markdown_unfixable": markdown_unfixable,
+            "hardcoded_paths": hardcoded_paths,
+            "personal_refs": personal_refs.result(),
+        }
 
     result["has_blockers"] = bool(result["secrets"])
     result["needs_review"] = bool(
@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["shapely", "requests"]
+# dependencies = ["shapely>=2", "requests"]
 # ///
 """
 EAWS Micro-Region Lookup
@@ -14,13 +14,20 @@ Usage:
 
 Returns JSON: {"region_code": "AT-07", "micro_region": "AT-07-22"}
 Exit code 1 if coordinates are outside known regions.
+
+Region boundaries are cached in ~/.cache/skitour for 24 hours.
 """
 
 import json
+import os
 import sys
+import time
+from functools import lru_cache
+from pathlib import Path
 from typing import TypedDict
 
 import requests
+from shapely import STRtree, prepare
 from shapely.geometry import Point, shape
 
 
@@ -42,6 +49,17 @@ GEOJSON_URL = (
     "https://regions.avalanches.org/micro-regions/{}_micro-regions.geojson.json"
 )
 
+# Downloaded boundaries change rarely; refetch them once a day
+# XDG_CACHE_HOME only counts if set to an absolute path, per the XDG spec
+_CACHE_HOME = Path(os.environ.get("XDG_CACHE_HOME") or ".")
+if not _CACHE_HOME.is_absolute():
+    _CACHE_HOME = Path.home() / ".cache"
+CACHE_DIR = _CACHE_HOME / "skitour"
+CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Shared so lookups across parent regions reuse the connection to the EAWS host
+SESSION = requests.Session()
+
 
 def get_parent_region(lat: float, lon: float) -> str | None:
     """Determine parent region code from coordinates using bounding boxes."""
@@ -51,27 +69,72 @@ def get_parent_region(lat: float, lon: float) -> str | None:
     return None
 
 
-def get_micro_region(lat: float, lon: float, parent: str) -> str | None:
-    """Find the micro-region containing the given point."""
-    point = Point(lon, lat)  # GeoJSON uses lon, lat order
+def fetch_geojson(parent: str) -> dict | None:
+    """Get the micro-region GeoJSON for a parent region, from cache if fresh."""
+    cache_file = CACHE_DIR / f"{parent}.geojson"
+    try:
+        if time.time() - cache_file.stat().st_mtime < CACHE_MAX_AGE:
+            return json.loads(cache_file.read_bytes())
+    except (OSError, json.JSONDecodeError):
+        pass  # Missing or corrupt cache, download again
 
     try:
-        resp = requests.get(GEOJSON_URL.format(parent), timeout=15)
+        resp = SESSION.get(GEOJSON_URL.format(parent), timeout=15)
         resp.raise_for_status()
         geojson = resp.json()
     except (requests.RequestException, json.JSONDecodeError) as e:
         print(f"Error fetching region data: {e}", file=sys.stderr)
         return None
 
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(resp.content)
+    except OSError:
+        pass  # Caching is best effort
+    return geojson
+
+
+@lru_cache(maxsize=None)
+def load_region_index(parent: str) -> tuple[STRtree, list[str]] | None:
+    """Build a spatial index over a parent region's micro-region polygons.
+
+    Returns the tree and the micro-region ids in tree order, or None if the
+    boundaries could not be fetched.
+    """
+    geojson = fetch_geojson(parent)
+    if geojson is None:
+        return None
+
+    polygons = []
+    ids = []
     for feature in geojson.get("features", []):
         try:
             polygon = shape(feature["geometry"])
-            if polygon.contains(point):
-                return feature["properties"]["id"]
+            region_id = feature["properties"]["id"]
         except (KeyError, TypeError, ValueError):
             # Skip malformed features (missing geometry, invalid coordinates, etc.)
             continue
+        polygons.append(polygon)
+        ids.append(region_id)
+
+    # Prepared polygons keep GEOS edge indexes around for repeated contains()
+    prepare(polygons)
+    return STRtree(polygons), ids
+
 
+def get_micro_region(lat: float, lon: float, parent: str) -> str | None:
+    """Find the micro-region containing the given point."""
+    index = load_region_index(parent)
+    if index is None:
+        return None
+    tree, ids = index
+
+    point = Point(lon, lat)  # GeoJSON uses lon, lat order
+    # The tree narrows to bounding box hits; test those against the prepared
+    # polygons in feature order, as with a linear scan
+    for i in sorted(tree.query(point)):
+        if tree.geometries[i].contains(point):
+            return ids[i]
     return None
 
 